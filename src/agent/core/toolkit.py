@@ -2,7 +2,7 @@ from __future__ import annotations
 import json
 import dataclasses
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any
 from agent.errors import ToolError
 from agent.core.config import ExtractAudioConfig
 from agent.tools.fetch import fetch_task
@@ -10,7 +10,6 @@ from agent.tools.extract import extract_audio_task
 from agent.tools.transcribe import transcribe_task
 from agent.tools.emit_output import emit_output
 from agent.tools.answer_from_metadata import answer_from_metadata
-from agent.llm.client import LLMClient
 from agent.tools.transcribe import summarise_gemini, summarise_url_direct
 
 
@@ -223,7 +223,6 @@ def emit_output(
     if "api" in targets and webhook_url:
         try:  # Lazy import to avoid hard dep when unused
             import urllib.request as _rq  # type: ignore
-            import urllib.error as _er  # type: ignore
             data = json.dumps({
                 "meta": meta,
                 "text": clean_text.strip(),
@@ -271,34 +271,73 @@ def extract_audio_task(
             boundaries = chunk_vad_energy(wav_out, cfg)
 
         ffmpeg_bin_local = ffmpeg_bin
-        for idx, (rel_s, rel_e) in enumerate(boundaries):
-            abs_s = cfg.start_offset_sec + rel_s
-            abs_e = cfg.start_offset_sec + rel_e
-            # Export audio chunk (wav)
-            out_path = base_dir / f"chunk_{idx:04d}_{base}.wav"
-            cmd = [
+
+        # Fast path: when the boundaries form a contiguous, non-overlapping
+        # partition of the *entire* output (duration strategy with
+        # chunk_overlap_sec=0), one ffmpeg -f segment invocation cuts every
+        # audio chunk in a single demux pass instead of spawning a process per
+        # chunk. segment_times always measures from 0 and the last segment
+        # runs to EOF, so the partition must start at 0 and end at out_dur;
+        # otherwise (the default 1s overlap, VAD bounds that trim silence)
+        # chunk content would drift from its recorded bounds, and those keep
+        # the per-chunk exports.
+        segmented = False
+        contiguous = (
+            len(boundaries) > 1
+            and abs(boundaries[0][0]) < 1e-6
+            and abs(boundaries[-1][1] - out_dur) < 1e-6
+            and all(abs(boundaries[i][0] - boundaries[i - 1][1]) < 1e-6 for i in range(1, len(boundaries)))
+        )
+        if contiguous:
+            cmd_seg = [
                 ffmpeg_bin_local,
                 "-hide_banner",
-                "-ss",
-                f"{rel_s:.3f}",
                 "-i",
                 str(wav_out),
-                "-t",
-                f"{max(0.01, rel_e - rel_s):.3f}",
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                str(cfg.sample_rate),
-                "-ac",
-                "1",
                 "-f",
-                "wav",
+                "segment",
+                "-segment_times",
+                ",".join(f"{e:.3f}" for _, e in boundaries[:-1]),
+                "-reset_timestamps",
+                "1",
+                "-c",
+                "copy",
                 "-y",
-                str(out_path),
+                str(base_dir / f"chunk_%04d_{base}.wav"),
             ]
-            code, out, err = _run(cmd, timeout=int(max(30, (rel_e - rel_s) * 5)))
-            if code != 0:
-                raise ToolError(f"Chunk export failed: {err[-400:]}", tool_name=tool)
+            code_s, out_s, err_s = _run(cmd_seg, timeout=max(120, int(out_dur or 60) * 2))
+            segmented = code_s == 0 and all(
+                (base_dir / f"chunk_{i:04d}_{base}.wav").exists() for i in range(len(boundaries))
+            )
+
+        for idx, (rel_s, rel_e) in enumerate(boundaries):
+            abs_s = cfg.start_offset_sec + rel_s
+            abs_e = cfg.start_offset_sec + rel_e
+            # Export audio chunk (wav) unless the segment pass already did
+            out_path = base_dir / f"chunk_{idx:04d}_{base}.wav"
+            if not segmented:
+                cmd = [
+                    ffmpeg_bin_local,
+                    "-hide_banner",
+                    "-ss",
+                    f"{rel_s:.3f}",
+                    "-i",
+                    str(wav_out),
+                    "-t",
+                    f"{max(0.01, rel_e - rel_s):.3f}",
+                    # wav_out is already pcm_s16le at the target rate/channels,
+                    # and PCM cuts are sample-accurate under stream copy, so
+                    # skip the pointless decode/re-encode cycle.
+                    "-c:a",
+                    "copy",
+                    "-f",
+                    "wav",
+                    "-y",
+                    str(out_path),
+                ]
+                code, out, err = _run(cmd, timeout=int(max(30, (rel_e - rel_s) * 5)))
+                if code != 0:
+                    raise ToolError(f"Chunk export failed: {err[-400:]}", tool_name=tool)
             sha = _sha256_file(out_path)
             ch = ChunkInfo(idx=idx, start_sec=abs_s, end_sec=abs_e, duration=max(0.0, abs_e - abs_s), path=str(out_path), sha256=sha)
             chunks.append(ch)
@@ -323,6 +362,9 @@ def extract_audio_task(
             code_v2, out_v2, err_v2 = _run(cmd_vid_copy, timeout=int(max(120, dur * 6)))
             if video_chunk.exists():
                 ch_dict["video_path"] = str(video_chunk)
+                # Record audio presence so consumers never have to ffprobe the
+                # chunk: -map 0:a? copies audio exactly when the source has it.
+                ch_dict["has_audio"] = bool(probe.get("audio_codec"))
 
             chunk_meta.append(ch_dict)
 
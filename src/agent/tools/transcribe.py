@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
 import logging
 import os
+import queue
+import random
+import re
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -14,68 +21,353 @@ from agent.contextengineering import allocate_tokens, to_generation_config
 
 logger = logging.getLogger(__name__)
 
-try:
-    from google import genai
-    from google.genai import types as genai_types  # type: ignore
+try:  # optional fast JSON; stdlib json remains the fallback
+    import orjson  # type: ignore
 except Exception:  # pragma: no cover
-    genai = None
-    genai_types = None  # type: ignore
+    orjson = None  # type: ignore
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+# google.genai pulls in grpc/protobuf and adds hundreds of ms to import time,
+# so it is loaded lazily on first client init rather than at module import
+# (tool modules are imported even when a session never touches Gemini).
+genai = None
+genai_types = None  # type: ignore
+
+
+def _ensure_genai() -> None:
+    """Import google.genai on first use and cache it in module globals."""
+    global genai, genai_types
+    if genai is not None:
+        return
+    try:
+        from google import genai as _genai
+        from google.genai import types as _genai_types  # type: ignore
+    except Exception:  # pragma: no cover
+        return
+    genai = _genai
+    genai_types = _genai_types
+
+
+# Per-chunk section skeleton for the map-reduce global prompt; compiled once at
+# import instead of re-evaluating a multi-line f-string per chunk.
+_CHUNK_PART_TMPL = (
+    "---\n"
+    "Chunk {idx}\n"
+    "Summary of this chunk:\n{summary}\n\n"
+    "Transcript excerpt:\n{excerpt}\n\n"
+)
+
+# Errors worth falling back to map-reduce for (capacity/limit shaped); compiled
+# once so the check is a single scan of the message instead of nine substring
+# probes over a lowered copy.
+_FALLBACK_ERR_RE = re.compile(r"context|token|length|too large|deadline|quota|rate|503|429", re.I)
+
+# Transient service failures worth retrying, and the server's own hint for
+# how long to wait (e.g. "Please retry in 12.3s", "retry after 30 seconds").
+_TRANSIENT_ERR_RE = re.compile(r"429|500|503|quota|rate|unavailable|overloaded|deadline|timed? ?out|temporar", re.I)
+_RETRY_AFTER_RE = re.compile(r"retry(?:\s+(?:in|after))?[^0-9]{0,10}(\d+(?:\.\d+)?)", re.I)
+
+# In-process memo of per-chunk Gemini transcriptions, keyed by media identity
+# (path, size, mtime_ns) and model. Complements the on-disk artifacts: repeat
+# transcribe_asr calls within one session skip the network round-trip entirely.
+_chunk_transcriptions: Dict[tuple, tuple[str, str, Optional[str]]] = {}
+
+# Gemini file handles for media already uploaded this session, keyed by
+# (path, size, mtime_ns). Uploads are the slowest leg of the pipeline for
+# long videos, and the same chunk files are attached again by
+# summarise_gemini right after transcription; reusing the server-side handle
+# turns those re-uploads into a files.get.
+_uploaded_media: Dict[tuple, str] = {}
+
+
+def _media_cache_key(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), st.st_size, st.st_mtime_ns)
+
+
+def _lookup_uploaded(client, path: str) -> Optional[Any]:
+    """Return a still-ACTIVE Gemini file for `path` if one was uploaded this
+    session, else None. Stale handles (expired server-side) are dropped."""
+    key = _media_cache_key(path)
+    name = _uploaded_media.get(key) if key is not None else None
+    if not name:
+        return None
+    try:
+        mf = client.files.get(name=name)
+        st = getattr(mf, "state", None)
+        if (getattr(st, "name", None) or str(st or "").upper()) == "ACTIVE":
+            return mf
+    except Exception:
+        pass
+    _uploaded_media.pop(key, None)
+    return None
+
+
+def _remember_uploaded(path: str, name: Optional[str]) -> None:
+    if not name:
+        return
+    key = _media_cache_key(path)
+    if key is not None:
+        _uploaded_media[key] = name
+
+
+class _TokenBucket:
+    """Token bucket over a monotonic clock: `rpm` requests per minute with
+    burst capacity `rpm`. acquire() blocks until a token is available."""
+
+    def __init__(self, rpm: float):
+        self._capacity = max(1.0, float(rpm))
+        self._tokens = self._capacity
+        self._fill_rate = self._capacity / 60.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._fill_rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._fill_rate
+            time.sleep(wait)
+
+
+class _AdaptiveLimiter:
+    """AIMD gate on in-flight chunk requests: halve the permitted concurrency
+    when the service throttles, creep back up one permit per success streak.
+    Lets a run start at the configured worker count and settle onto whatever
+    the service will actually sustain instead of hammering 429s."""
+
+    def __init__(self, limit: int):
+        self._cond = threading.Condition()
+        self._cap = max(1, int(limit))
+        self._limit = self._cap
+        self._in_flight = 0
+        self._streak = 0
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self._limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, *, throttled: bool = False) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self._limit = max(1, self._limit // 2)
+                self._streak = 0
+            else:
+                self._streak += 1
+                if self._streak >= 3 and self._limit < self._cap:
+                    self._limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
+
+
+_gen_bucket: Optional[_TokenBucket] = None
+
+
+def _acquire_generate_slot() -> None:
+    """Pace generate_content calls to GEMINI_RPM requests/minute across all
+    chunk workers. No-op (the default) when the env var is unset or invalid:
+    pacing requests below the account ceiling is cheaper than eating 429s
+    and retry backoff after the fact, but the right ceiling is per-account,
+    so it stays opt-in."""
+    global _gen_bucket
+    raw = (os.getenv("GEMINI_RPM") or "").strip()
+    if not raw:
+        return
+    if _gen_bucket is None:
+        try:
+            _gen_bucket = _TokenBucket(float(raw))
+        except Exception:
+            return
+    _gen_bucket.acquire()
+
+# Constant body of the per-chunk transcription prompt; only the segment-bounds
+# header varies per chunk, so the large literal is assembled once at import.
+_TRANSCRIBE_PROMPT_BODY = (
+    "TRANSCRIPTION REQUIREMENTS:\n\n"
+    "SPEECH & AUDIO:\n"
+    "• Transcribe ALL spoken words with maximum accuracy\n"
+    "• Preserve natural speech patterns: \"um\", \"uh\", false starts, repetitions, interruptions\n"
+    "• Use clear speaker labels: \"Speaker 1:\", \"Host:\", \"Interviewer:\", \"Guest:\", etc.\n"
+    "• Mark unclear speech: [inaudible], [unclear], [mumbled]\n"
+    "• Note overlapping speech: [Speaker 1 & 2 speaking simultaneously]\n"
+    "• Include meaningful pauses: [pause], [long pause]\n"
+    "• Capture relevant audio cues: [music], [applause], [phone ringing], [door closing]\n"
+    "• Note audio quality issues: [low quality], [distorted], [echo], [static]\n\n"
+    "VISUAL ELEMENTS (for video content):\n"
+    "• Transcribe ALL readable on-screen text, captions, titles, signs, documents\n"
+    "• Format as [SCREEN TEXT: \"content\"], [CAPTION: \"subtitle\"], [SIGN: \"exit\"]\n"
+    "• Include UI elements: [BUTTON: \"Submit\"], [MENU: \"File > Save\"]\n"
+    "• Note visual context: [showing graph], [pointing to screen], [slide change]\n"
+    "• Capture timestamps, URLs, phone numbers if clearly visible\n"
+    "• Include title cards, lower thirds, and visual overlays\n\n"
+    "CONTENT ORGANIZATION:\n"
+    "• Maintain chronological order within the segment\n"
+    "• Use natural paragraph breaks for topic shifts\n"
+    "• Preserve conversational flow and turn-taking\n"
+    "• Include relevant context for references (\"as mentioned earlier\", \"this chart shows\")\n\n"
+    "ACCURACY STANDARDS:\n"
+    "• Prioritize precision over interpretation\n"
+    "• Do not add commentary, analysis, or speculation\n"
+    "• Include exact quotes, especially for important statements\n"
+    "• Note when content seems incomplete or cut off\n"
+    "• Mark technical terms, names, or specialized vocabulary carefully\n\n"
+    "ERROR HANDLING:\n"
+    "• Use [inaudible] for speech that cannot be understood\n"
+    "• Use [unclear: possible word] for best-guess transcription\n"
+    "• Note [audio cuts out] or [video freezes] for technical issues\n"
+    "• Mark [multiple speakers - unclear] when speaker separation is impossible\n\n"
+    "OUTPUT FORMAT - Use these EXACT delimiters:\n\n"
+    "<TRANSCRIPT>\n"
+    "Provide the complete, accurate transcription here.\n\n"
+    "Include all speech, on-screen text, and relevant audio/visual cues.\n"
+    "Use proper punctuation, capitalization, and speaker labels.\n"
+    "Maintain natural flow while being comprehensive.\n"
+    "No commentary or interpretation - only what is actually present.\n"
+    "</TRANSCRIPT>\n\n"
+    "<SUMMARY>\n"
+    "Provide 4-8 concise bullet points covering:\n"
+    "• Primary topics, themes, or subjects discussed\n"
+    "• Key information, facts, decisions, or announcements\n"
+    "• Important speakers, participants, or sources mentioned\n"
+    "• Significant events, changes, or developments in this segment\n"
+    "• Critical visual information (charts, documents, demonstrations)\n"
+    "• Notable quotes or statements (if particularly important)\n"
+    "• Context that connects to likely adjacent segments\n\n"
+    "Base summary only on content actually present in this specific segment.\n"
+    "Use clear, factual language without speculation or interpretation.\n"
+    "Do not include timestamps in the SUMMARY.\n"
+    "</SUMMARY>\n\n"
+    "CRITICAL: Use the EXACT delimiter tags shown above. The parsing system depends on finding \"<TRANSCRIPT>\" and \"</TRANSCRIPT>\" as well as \"<SUMMARY>\" and \"</SUMMARY>\" exactly as written."
+)
+
+
+@lru_cache(maxsize=4096)
+def _wav_duration_cached(path_str: str, mtime_ns: int) -> float:
+    import wave
+
+    with wave.open(path_str, "rb") as w:
+        rate = w.getframerate()
+        return (w.getnframes() / float(rate)) if rate else 0.0
+
+
+def _wav_duration(path: str) -> float:
+    """Exact duration read from the WAV header; 0.0 when unreadable.
+
+    Manifest durations are upstream-computed floats that can drift if chunks
+    were rewritten; the 44-byte header read is cheap and authoritative, and the
+    (path, mtime) cache makes repeat lookups a single stat.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return 0.0
+    try:
+        return _wav_duration_cached(path, mtime_ns)
+    except Exception:
+        return 0.0
+
+
+@lru_cache(maxsize=64)
+def _load_manifest_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    return _json_loads(Path(path_str).read_bytes())
 
 
 def _load_manifest(path: Path) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Parse an extract manifest, memoized on (path, mtime).
+
+    transcribe_task and summarise_gemini both re-read the same manifest within
+    a session; the mtime key keeps the cache honest if extract re-runs.
+    Callers treat the returned dict as read-only.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return _json_loads(path.read_bytes())
+    return _load_manifest_cached(str(path), mtime_ns)
 
 
 def _find_latest_extract_manifest(runtime_dir: Path) -> Optional[Path]:
-    """Find the most recent extract manifest file."""
+    """Find the most recent extract manifest file.
+
+    Single os.scandir pass: the dirent type check reuses what the directory
+    read already fetched, and one os.stat per candidate covers both the
+    existence check and the mtime comparison.
+    """
     base = Path(runtime_dir) / "cache" / "extract"
     logger.debug("Looking for manifests in: %s", base.resolve())
-    
-    if not base.exists():
+
+    best_mtime = 0
+    best_path: Optional[Path] = None
+    try:
+        it = os.scandir(base)
+    except OSError:
         logger.debug("Extract cache directory does not exist: %s", base)
         return None
-        
-    newest: tuple[float, Optional[Path]] = (0.0, None)
-    found_dirs = []
-    
-    for child in base.iterdir():
-        if not child.is_dir():
-            continue
-        found_dirs.append(str(child))
-        mp = child / "extract_audio.manifest.json"
-        logger.debug("Checking manifest path: %s", mp.resolve())
-        
-        if mp.exists():
+    with it:
+        for entry in it:
             try:
-                mt = mp.stat().st_mtime
-                logger.debug("Found manifest with mtime %s: %s", mt, mp)
-                if mt >= newest[0]:
-                    newest = (mt, mp)
-            except Exception as e:
-                logger.debug("Error getting mtime for %s: %s", mp, e)
-                mt = 0.0
-    
-    logger.debug("Found directories in extract cache: %s", found_dirs)
-    logger.debug("Selected manifest: %s", newest[1])
-    return newest[1]
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            mp = os.path.join(entry.path, "extract_audio.manifest.json")
+            try:
+                mt = os.stat(mp).st_mtime_ns
+            except OSError:
+                continue
+            logger.debug("Found manifest with mtime %s: %s", mt, mp)
+            if mt >= best_mtime:
+                best_mtime = mt
+                best_path = Path(mp)
+    logger.debug("Selected manifest: %s", best_path)
+    return best_path
 
 
 def _poll_file_active(client, name: str, max_wait: float = 300.0, poll_interval: Optional[float] = None) -> bool:
     """Poll a Gemini file handle until it becomes ACTIVE or FAILED.
 
-    Respects GEMINI_FILE_POLL_INTERVAL (seconds) if provided; defaults to 0.5s (optimized).
+    Default schedule is short-then-long with decorrelated jitter (100ms up to
+    a 4s cap): small files usually activate well under the old fixed 0.5s
+    interval, and the jitter keeps parallel workers from hitting the API in
+    lockstep. A fixed GEMINI_FILE_POLL_INTERVAL (seconds) overrides the
+    schedule when set. The deadline uses time.monotonic so wall-clock jumps
+    cannot stretch or truncate the wait.
     """
     if poll_interval is None:
-        try:
-            poll_interval = float(os.getenv("GEMINI_FILE_POLL_INTERVAL", "0.5") or 0.5)
-        except Exception:
-            poll_interval = 0.5
-    if poll_interval <= 0:
-        poll_interval = 2.0
-
-    t0 = time.time()
-    while (time.time() - t0) < max_wait:
+        raw = (os.getenv("GEMINI_FILE_POLL_INTERVAL") or "").strip()
+        if raw:
+            try:
+                poll_interval = float(raw)
+            except ValueError:
+                poll_interval = None
+        if poll_interval is not None and poll_interval <= 0:
+            poll_interval = 2.0
+
+    sleep_s = 0.1
+    deadline = time.monotonic() + max_wait
+    while time.monotonic() < deadline:
         try:
             f = client.files.get(name=name)
             state = getattr(f, "state", None)
@@ -87,12 +379,21 @@ def _poll_file_active(client, name: str, max_wait: float = 300.0, poll_interval:
         except Exception:
             # transient error, keep polling
             pass
-        time.sleep(poll_interval)
+        if poll_interval is not None:
+            time.sleep(poll_interval)
+        else:
+            sleep_s = min(4.0, random.uniform(sleep_s, sleep_s * 3))
+            time.sleep(sleep_s)
     return False
 
 
+@lru_cache(maxsize=16)
 def _load_prompt_text(filename: str) -> str:
-    """Load a prompt text from package resources with robust fallback."""
+    """Load a prompt text from package resources with robust fallback.
+
+    Cached per filename: prompts are static package data, and every
+    summarise call was re-running the importlib.resources lookup and read.
+    """
     try:
         from importlib.resources import files as _res_files  # Python 3.9+
         return (_res_files("agent") / "prompts" / filename).read_text(encoding="utf-8")
@@ -104,24 +405,59 @@ def _load_prompt_text(filename: str) -> str:
             return ""
 
 
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write bytes in one shot via a temp file + os.replace.
+
+    A single buffered write plus rename means readers (and concurrent chunk
+    workers) never observe a partially written file.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """Write UTF-8 text atomically; encodes once, skipping TextIOWrapper."""
+    _write_bytes_atomic(path, text.encode("utf-8"))
+
+
 def _fmt_ts(seconds: float | int | None) -> str:
+    # Integer-only: avoid the int(float(...)) round-trip on what is almost
+    # always already a number; this runs twice per chunk on the hot path.
+    # int() stays inside the try: stdlib json parses NaN/Infinity out of a
+    # manifest, and those must fall back to 0 rather than raise here.
     try:
-        total = int(float(seconds or 0))
+        total = int(seconds) if isinstance(seconds, (int, float)) else int(float(seconds or 0))
     except Exception:
         total = 0
-    h = total // 3600
-    m = (total % 3600) // 60
-    s = total % 60
+    h, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
     return f"{h:02d}:{m:02d}:{s:02d}" if h > 0 else f"{m:02d}:{s:02d}"
 
 
+# One client per API key, shared by every tool in this module. Client
+# construction sets up auth/transport state worth reusing, and the SDK client
+# is safe to share across the chunk worker threads.
+_gemini_clients: Dict[str, Any] = {}
+
+
 def _init_gemini_client(tool_name: str):
+    _ensure_genai()
     if genai is None:  # type: ignore
         raise ToolError("Missing dependency: google-genai", tool_name=tool_name)
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ToolError("Missing Google API key. Set GOOGLE_API_KEY.", tool_name=tool_name)
-    return genai.Client(api_key=api_key)
+    client = _gemini_clients.get(api_key)
+    if client is None:
+        client = genai.Client(api_key=api_key)
+        _gemini_clients[api_key] = client
+    return client
+
+
+# Well-formed responses match in one pass with no lowercased copy of the
+# multi-MB text; the heuristic fallback below only runs when this misses.
+_SPLIT_RE = re.compile(r"<transcript>\s*(.*?)\s*</transcript>.*?<summary>\s*(.*?)\s*</summary>", re.I | re.S)
 
 
 def _split_transcript_summary(text: str) -> tuple[str, str]:
@@ -132,6 +468,9 @@ def _split_transcript_summary(text: str) -> tuple[str, str]:
     """
     if not text:
         return "", ""
+    m = _SPLIT_RE.search(text)
+    if m:
+        return m.group(1), m.group(2)
     lo = text.lower()
     start_t = lo.find("<transcript>")
     end_t = lo.find("</transcript>")
@@ -243,30 +582,55 @@ def transcribe_task(
     chunks_meta = res.get("chunks", [])
     if not chunks_meta:
         # Single-file fallback
-        wav_path = manifest.get("result", {}).get("wav_path")
-        dur = float(manifest.get("result", {}).get("duration", 0.0) or 0.0)
+        wav_path = res.get("wav_path")
+        dur = float(res.get("duration", 0.0) or 0.0)
         if not wav_path:
             raise ToolError("Manifest missing wav_path.", tool_name=tool)
+        if not dur:
+            dur = _wav_duration(str(wav_path))
         chunks_meta = [{"idx": 0, "start_sec": 0.0, "end_sec": dur, "path": str(wav_path)}]
 
     # Determine media preference: use audio-only (WAV) for very long videos
     try:
         total_duration_s = float(res.get("duration", 0.0) or 0.0)
     except Exception:
-        # Fallback to max chunk end if duration missing
-        try:
-            total_duration_s = max(float(ch.get("end_sec", 0.0) or 0.0) for ch in chunks_meta) if chunks_meta else 0.0
-        except Exception:
-            total_duration_s = 0.0
+        total_duration_s = 0.0
+    if not total_duration_s:
+        # Fallback to max chunk end if duration missing. Guard per entry so one
+        # malformed chunk doesn't zero the estimate for the whole manifest.
+        for ch in chunks_meta:
+            try:
+                end_s = float(ch.get("end_sec", 0.0) or 0.0)
+            except Exception:
+                continue
+            if end_s > total_duration_s:
+                total_duration_s = end_s
+    if not total_duration_s and res.get("wav_path"):
+        # Last resort: read the WAV header rather than trusting nothing
+        total_duration_s = _wav_duration(str(res["wav_path"]))
     try:
         audio_only_minutes = float(os.getenv("ASR_AUDIO_ONLY_MINUTES", "60") or 60)
     except Exception:
         audio_only_minutes = 60.0
-    prefer_wav = total_duration_s >= (audio_only_minutes * 60.0)
+    # Audio chunks upload in a fraction of the time and tokens of the mp4s;
+    # video is kept for shorter content because the prompt transcribes
+    # on-screen text and visuals. ASR_PREFER_AUDIO=1 forces wav regardless
+    # of duration for speed- or quota-bound runs.
+    prefer_wav = total_duration_s >= (audio_only_minutes * 60.0) or (
+        (os.getenv("ASR_PREFER_AUDIO", "") or "").strip().lower() in {"1", "true", "yes", "on"}
+    )
 
     # Client and model
     client = _init_gemini_client(tool)
     gemini_model = model or os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    try:
+        file_wait_timeout = float(os.getenv("GEMINI_FILE_WAIT_TIMEOUT", "60"))  # Optimized: reduced from 300 to 60
+    except Exception:
+        file_wait_timeout = 60.0
+    # The .gemini.json artifact doubles as the resume record below; allow
+    # skipping it for large runs where resume isn't wanted.
+    persist_json = (os.getenv("TRANSCRIBE_PERSIST_JSON", "1") or "1").strip().lower() not in {"0", "false", "no", "off"}
+    resume_on = (os.getenv("TRANSCRIBE_RESUME", "1") or "1").strip().lower() not in {"0", "false", "no", "off"}
 
     out_dir = manifest_p.parent
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -275,137 +639,203 @@ def transcribe_task(
     chunk_results: List[Chunk] = []
     artifacts: Dict[str, Any] = {"manifest_path": str(manifest_p), "gemini_model": gemini_model, "chunks": []}
 
-    # Helper function to process a single chunk
-    def _process_chunk(ch: dict) -> tuple[int, float, float, str, str, str, dict]:
-        """Process a single chunk: upload, poll, transcribe. Returns (idx, start_s, end_s, text, summary, media_path, chunk_artifact)"""
-        idx = int(ch.get("idx", 0))
-        start_s = float(ch.get("start_sec", 0.0))
-        end_s = float(ch.get("end_sec", max(start_s, 0.0)))
-        media_path = (ch.get("path") if prefer_wav else (ch.get("video_path") or ch.get("path")))
-        if not media_path or not Path(media_path).exists():
-            raise ToolError(f"Chunk not found: {media_path}", tool_name=tool)
-        
-        logger.debug("Processing chunk %d (%.1fs-%.1fs)", idx, start_s, end_s)
-
-        # Upload
+    # Pre-validate chunk media with one scandir pass per directory, replacing a
+    # stat syscall per chunk inside the workers with a set lookup.
+    candidate_media = {str(p) for ch in chunks_meta for p in (ch.get("path"), ch.get("video_path")) if p}
+    existing_media: set = set()
+    for d in {os.path.dirname(p) for p in candidate_media}:
         try:
-            myfile = client.files.upload(file=str(media_path))
-        except Exception as e:
-            raise ToolError(f"Gemini file upload failed for chunk {idx}: {e}", tool_name=tool)
-
-        # Poll until ACTIVE (early check on immediate state)
-        max_wait = float(os.getenv("GEMINI_FILE_WAIT_TIMEOUT", "60"))  # Optimized: reduced from 300 to 60
-        state0 = getattr(myfile, "state", None)
-        state0_name = getattr(state0, "name", None) or str(state0 or "").upper()
-        if state0_name == "ACTIVE":
-            ok = True
-        elif state0_name == "FAILED":
-            ok = False
-        else:
-            ok = _poll_file_active(
-                client,
-                name=getattr(myfile, "name", None) or getattr(myfile, "id", None) or str(myfile),
-                max_wait=max_wait,
-            )
-        if not ok:
-            raise ToolError(f"Gemini file did not become ACTIVE within {int(max_wait)}s (chunk {idx}).", tool_name=tool)
+            with os.scandir(d) as it:
+                existing_media.update(e.path for e in it)
+        except OSError:
+            continue
+
+    # Artifact writes happen off the chunk workers: workers enqueue encoded
+    # payloads and a single writer thread drains them atomically, so a slow
+    # disk never holds a worker between network calls.
+    write_q: "queue.Queue[Optional[tuple[Path, bytes]]]" = queue.Queue()
+
+    def _drain_writes() -> None:
+        while True:
+            item = write_q.get()
+            if item is None:
+                return
+            path, data = item
+            try:
+                _write_bytes_atomic(path, data)
+            except Exception:
+                pass
+
+    writer_thread = threading.Thread(target=_drain_writes, name="chunk-artifact-writer", daemon=True)
+    writer_thread.start()
+
+    # Helper running the network half for one chunk (upload, poll, generate)
+    def _upload_and_generate(media_path: str, idx: int, start_s: float, end_s: float) -> tuple[str, str, Optional[str]]:
+        """Upload a chunk, wait for ACTIVE, transcribe. Returns (text, summary, gemini_file_name)."""
+        # Reuse a handle uploaded earlier this session (e.g. a retried run)
+        # before paying for the upload again.
+        myfile = _lookup_uploaded(client, str(media_path))
+        if myfile is None:
+            # Upload
+            try:
+                myfile = client.files.upload(file=str(media_path))
+            except Exception as e:
+                raise ToolError(f"Gemini file upload failed for chunk {idx}: {e}", tool_name=tool)
+
+            # Poll until ACTIVE (early check on immediate state)
+            max_wait = file_wait_timeout
+            state0 = getattr(myfile, "state", None)
+            state0_name = getattr(state0, "name", None) or str(state0 or "").upper()
+            if state0_name == "ACTIVE":
+                ok = True
+            elif state0_name == "FAILED":
+                ok = False
+            else:
+                ok = _poll_file_active(
+                    client,
+                    name=getattr(myfile, "name", None) or getattr(myfile, "id", None) or str(myfile),
+                    max_wait=max_wait,
+                )
+            if not ok:
+                raise ToolError(f"Gemini file did not become ACTIVE within {int(max_wait)}s (chunk {idx}).", tool_name=tool)
+            _remember_uploaded(str(media_path), getattr(myfile, "name", None) or getattr(myfile, "id", None))
 
         # Transcribe + Summarize (single call, structured output)
         # Inline prompt with exact delimiters as required by downstream parsing
         prompt = (
             "You are an expert transcriptionist and content analyst processing a media segment.\n"
             f"Segment bounds: start={_fmt_ts(start_s)}, end={_fmt_ts(end_s)}.\n\n"
-            "TRANSCRIPTION REQUIREMENTS:\n\n"
-            "SPEECH & AUDIO:\n"
-            "• Transcribe ALL spoken words with maximum accuracy\n"
-            "• Preserve natural speech patterns: \"um\", \"uh\", false starts, repetitions, interruptions\n"
-            "• Use clear speaker labels: \"Speaker 1:\", \"Host:\", \"Interviewer:\", \"Guest:\", etc.\n"
-            "• Mark unclear speech: [inaudible], [unclear], [mumbled]\n"
-            "• Note overlapping speech: [Speaker 1 & 2 speaking simultaneously]\n"
-            "• Include meaningful pauses: [pause], [long pause]\n"
-            "• Capture relevant audio cues: [music], [applause], [phone ringing], [door closing]\n"
-            "• Note audio quality issues: [low quality], [distorted], [echo], [static]\n\n"
-            "VISUAL ELEMENTS (for video content):\n"
-            "• Transcribe ALL readable on-screen text, captions, titles, signs, documents\n"
-            "• Format as [SCREEN TEXT: \"content\"], [CAPTION: \"subtitle\"], [SIGN: \"exit\"]\n"
-            "• Include UI elements: [BUTTON: \"Submit\"], [MENU: \"File > Save\"]\n"
-            "• Note visual context: [showing graph], [pointing to screen], [slide change]\n"
-            "• Capture timestamps, URLs, phone numbers if clearly visible\n"
-            "• Include title cards, lower thirds, and visual overlays\n\n"
-            "CONTENT ORGANIZATION:\n"
-            "• Maintain chronological order within the segment\n"
-            "• Use natural paragraph breaks for topic shifts\n"
-            "• Preserve conversational flow and turn-taking\n"
-            "• Include relevant context for references (\"as mentioned earlier\", \"this chart shows\")\n\n"
-            "ACCURACY STANDARDS:\n"
-            "• Prioritize precision over interpretation\n"
-            "• Do not add commentary, analysis, or speculation\n"
-            "• Include exact quotes, especially for important statements\n"
-            "• Note when content seems incomplete or cut off\n"
-            "• Mark technical terms, names, or specialized vocabulary carefully\n\n"
-            "ERROR HANDLING:\n"
-            "• Use [inaudible] for speech that cannot be understood\n"
-            "• Use [unclear: possible word] for best-guess transcription\n"
-            "• Note [audio cuts out] or [video freezes] for technical issues\n"
-            "• Mark [multiple speakers - unclear] when speaker separation is impossible\n\n"
-            "OUTPUT FORMAT - Use these EXACT delimiters:\n\n"
-            "<TRANSCRIPT>\n"
-            "Provide the complete, accurate transcription here.\n\n"
-            "Include all speech, on-screen text, and relevant audio/visual cues.\n"
-            "Use proper punctuation, capitalization, and speaker labels.\n"
-            "Maintain natural flow while being comprehensive.\n"
-            "No commentary or interpretation - only what is actually present.\n"
-            "</TRANSCRIPT>\n\n"
-            "<SUMMARY>\n"
-            "Provide 4-8 concise bullet points covering:\n"
-            "• Primary topics, themes, or subjects discussed\n"
-            "• Key information, facts, decisions, or announcements\n"
-            "• Important speakers, participants, or sources mentioned\n"
-            "• Significant events, changes, or developments in this segment\n"
-            "• Critical visual information (charts, documents, demonstrations)\n"
-            "• Notable quotes or statements (if particularly important)\n"
-            "• Context that connects to likely adjacent segments\n\n"
-            "Base summary only on content actually present in this specific segment.\n"
-            "Use clear, factual language without speculation or interpretation.\n"
-            "Do not include timestamps in the SUMMARY.\n"
-            "</SUMMARY>\n\n"
-            "CRITICAL: Use the EXACT delimiter tags shown above. The parsing system depends on finding \"<TRANSCRIPT>\" and \"</TRANSCRIPT>\" as well as \"<SUMMARY>\" and \"</SUMMARY>\" exactly as written."
+            + _TRANSCRIBE_PROMPT_BODY
         )
+        # Transient failures (429/503/timeouts) get a bounded retry instead of
+        # failing the whole run; the upload handle is reused across attempts so
+        # a retry only re-pays the generate call. Waits honor the server's
+        # "retry in Ns" hint when present, else decorrelated jitter.
         try:
-            response = client.models.generate_content(
-                model=gemini_model,
-                contents=[myfile, prompt],
-            )
-        except Exception as e:
-            raise ToolError(f"Gemini generate_content failed for chunk {idx}: {e}", tool_name=tool)
+            retries = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
+        except Exception:
+            retries = 2
+        try:
+            backoff_max = float(os.getenv("GEMINI_BACKOFF_MAX", "30"))
+        except Exception:
+            backoff_max = 30.0
+        delay = 1.0
+        last_err: Optional[Exception] = None
+        for attempt in range(max(0, retries) + 1):
+            if attempt:
+                m = _RETRY_AFTER_RE.search(str(last_err))
+                if m:
+                    try:
+                        delay = min(60.0, float(m.group(1)))
+                    except ValueError:
+                        pass
+                else:
+                    delay = min(backoff_max, random.uniform(1.0, delay * 3))
+                logger.debug("Chunk %d: transient Gemini error, retry %d/%d in %.1fs", idx, attempt, retries, delay)
+                time.sleep(delay)
+            _acquire_generate_slot()
+            try:
+                response = client.models.generate_content(
+                    model=gemini_model,
+                    contents=[myfile, prompt],
+                )
+                break
+            except Exception as e:
+                last_err = e
+                if attempt >= retries or not _TRANSIENT_ERR_RE.search(str(e)):
+                    raise ToolError(f"Gemini generate_content failed for chunk {idx}: {e}", tool_name=tool)
 
         full_text = (getattr(response, "text", None) or "").strip()
         transcript_text, summary_text = _split_transcript_summary(full_text)
-        text = transcript_text
+        return transcript_text, summary_text, (getattr(myfile, "name", None) or getattr(myfile, "id", None))
+
+    # Helper function to process a single chunk
+    def _process_chunk(ch: dict) -> tuple[int, float, float, str, str, str, dict]:
+        """Process a single chunk: upload, poll, transcribe. Returns (idx, start_s, end_s, text, summary, media_path, chunk_artifact)"""
+        idx = int(ch.get("idx", 0))
+        start_s = float(ch.get("start_sec", 0.0))
+        end_s = float(ch.get("end_sec", max(start_s, 0.0)))
+        media_path = (ch.get("path") if prefer_wav else (ch.get("video_path") or ch.get("path")))
+        if not media_path or str(media_path) not in existing_media:
+            raise ToolError(f"Chunk not found: {media_path}", tool_name=tool)
+        media_kind = "audio_wav" if str(media_path).lower().endswith(".wav") else "video"
+
+        logger.debug("Processing chunk %d (%.1fs-%.1fs)", idx, start_s, end_s)
 
-        # Write artifacts per chunk
         txt_path = out_dir / f"chunk_{idx:04d}.gemini.txt"
         sum_path = out_dir / f"chunk_{idx:04d}.summary.txt"
         json_path = out_dir / f"chunk_{idx:04d}.gemini.json"
+
+        # In-process memo: retries and repeat transcribe_asr calls within this
+        # session skip the upload + generate round-trip for unchanged media.
         try:
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write(text + "\n")
-            with open(sum_path, "w", encoding="utf-8") as f:
-                f.write((summary_text or "").strip() + "\n")
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "model": gemini_model,
-                        "file": str(media_path),
-                        "gemini_file_name": getattr(myfile, "name", None) or getattr(myfile, "id", None),
-                        "text": text,
-                        "summary": summary_text,
-                        "used_media_kind": ("audio_wav" if str(media_path).lower().endswith(".wav") else "video"),
-                    },
-                    f,
+            st_info = os.stat(media_path)
+            memo_key = (str(media_path), st_info.st_size, st_info.st_mtime_ns, gemini_model)
+        except OSError:
+            st_info = None
+            memo_key = None
+        cached = _chunk_transcriptions.get(memo_key) if memo_key is not None else None
+
+        # On-disk resume: a previous run of this process (or an earlier one)
+        # already transcribed this exact media if the JSON artifact records the
+        # same source identity and model. Quota is the binding resource, so
+        # don't pay for the chunk twice.
+        if cached is None and memo_key is not None and resume_on:
+            try:
+                rec = _json_loads(json_path.read_bytes())
+            except Exception:
+                rec = None
+            if (
+                isinstance(rec, dict)
+                and rec.get("text")
+                and rec.get("model") == gemini_model
+                and rec.get("file") == str(media_path)
+                and rec.get("src_size") == st_info.st_size
+                and rec.get("src_mtime_ns") == st_info.st_mtime_ns
+            ):
+                cached = (rec["text"], rec.get("summary") or "", rec.get("gemini_file_name"))
+                _chunk_transcriptions[memo_key] = cached
+                logger.debug("Chunk %d resumed from on-disk artifact", idx)
+
+        if cached is not None:
+            text, summary_text, gem_name = cached
+            logger.debug("Chunk %d served from cache", idx)
+        else:
+            if adaptive_limiter is not None:
+                adaptive_limiter.acquire()
+                try:
+                    text, summary_text, gem_name = _upload_and_generate(media_path, idx, start_s, end_s)
+                except Exception as e:
+                    adaptive_limiter.release(throttled=bool(_TRANSIENT_ERR_RE.search(str(e))))
+                    raise
+                else:
+                    adaptive_limiter.release()
+            else:
+                text, summary_text, gem_name = _upload_and_generate(media_path, idx, start_s, end_s)
+            if memo_key is not None:
+                _chunk_transcriptions[memo_key] = (text, summary_text, gem_name)
+
+        # Write artifacts per chunk
+        write_q.put((txt_path, (text + "\n").encode("utf-8")))
+        write_q.put((sum_path, ((summary_text or "").strip() + "\n").encode("utf-8")))
+        if persist_json:
+            write_q.put(
+                (
+                    json_path,
+                    _json_dumps(
+                        {
+                            "model": gemini_model,
+                            "file": str(media_path),
+                            "gemini_file_name": gem_name,
+                            "text": text,
+                            "summary": summary_text,
+                            "used_media_kind": media_kind,
+                            "src_size": (st_info.st_size if st_info is not None else None),
+                            "src_mtime_ns": (st_info.st_mtime_ns if st_info is not None else None),
+                        }
+                    ),
                 )
-        except Exception:
-            pass
+            )
 
         # Build chunk artifact dict
         chunk_artifact = {
@@ -414,11 +844,11 @@ def transcribe_task(
             "end_sec": end_s,
             "video_path": ch.get("video_path"),
             "used_media_path": media_path,
-            "used_media_kind": ("audio_wav" if str(media_path).lower().endswith(".wav") else "video"),
+            "used_media_kind": media_kind,
             "text_path": str(txt_path),
-            "json_path": str(json_path),
+            "json_path": str(json_path) if persist_json else None,
             "summary_path": str(sum_path),
-            "gemini_file_name": getattr(myfile, "name", None) or getattr(myfile, "id", None),
+            "gemini_file_name": gem_name,
             "chars": len(text),
             "summary_chars": len(summary_text or ""),
         }
@@ -427,48 +857,86 @@ def transcribe_task(
         return (idx, start_s, end_s, text, summary_text, media_path, chunk_artifact)
 
     # Process chunks with concurrency for better performance
-    max_workers = int(os.getenv("TRANSCRIBE_CONCURRENCY", "4"))  # Default 4 workers
+    try:
+        max_workers = int(os.getenv("TRANSCRIBE_CONCURRENCY", "4"))  # Default 4 workers
+    except Exception:
+        max_workers = 4
+    # Never spin up more workers than chunks: oversized pools only add idle
+    # threads, and synchronized bursts sharpen 429s against the service-side
+    # concurrency ceiling.
+    max_workers = max(1, min(max_workers, len(chunks_meta)))
     logger.info("Processing %d chunks with concurrency=%d", len(chunks_meta), max_workers)
+
+    # Optional AIMD gate (TRANSCRIBE_ADAPTIVE=1): starts at max_workers and
+    # backs off when the service throttles, instead of every worker retrying
+    # at full pressure. Off by default; the fixed pool is fine within quota.
+    adaptive_limiter: Optional[_AdaptiveLimiter] = None
+    if max_workers > 1 and (os.getenv("TRANSCRIBE_ADAPTIVE", "") or "").strip().lower() in {"1", "true", "yes", "on"}:
+        adaptive_limiter = _AdaptiveLimiter(max_workers)
     
-    if len(chunks_meta) == 1 or max_workers <= 1:
-        # Single chunk or no concurrency: process sequentially
-        for ch in chunks_meta:
-            idx, start_s, end_s, text, summary_text, media_path, chunk_artifact = _process_chunk(ch)
-            combined_parts.append(text)
-            chunk_results.append(Chunk(start_s=int(start_s), end_s=int(end_s), text=text, summary=(summary_text or None)))
-            artifacts["chunks"].append(chunk_artifact)
-    else:
-        # Multiple chunks: use concurrent processing
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all chunks for processing
-            future_to_chunk = {executor.submit(_process_chunk, ch): ch for ch in chunks_meta}
-            
-            # Collect results as they complete
-            chunk_data = []
-            for future in as_completed(future_to_chunk):
-                try:
-                    result = future.result()
-                    chunk_data.append(result)
-                except Exception as e:
-                    ch = future_to_chunk[future]
-                    idx = ch.get("idx", "?")
-                    raise ToolError(f"Chunk {idx} processing failed: {e}", tool_name=tool)
-            
-            # Sort by index to maintain order
-            chunk_data.sort(key=lambda x: x[0])
-            
-            # Build results in order
-            for idx, start_s, end_s, text, summary_text, media_path, chunk_artifact in chunk_data:
-                combined_parts.append(text)
+    try:
+        if len(chunks_meta) == 1 or max_workers <= 1:
+            # Single chunk or no concurrency: process sequentially
+            for ch in chunks_meta:
+                idx, start_s, end_s, text, summary_text, media_path, chunk_artifact = _process_chunk(ch)
+                if text:
+                    combined_parts.append(text)
                 chunk_results.append(Chunk(start_s=int(start_s), end_s=int(end_s), text=text, summary=(summary_text or None)))
                 artifacts["chunks"].append(chunk_artifact)
+        else:
+            # Multiple chunks: use concurrent processing. Manifest order is
+            # known up front, so completed results drop into a pre-sized slot
+            # list keyed by submission position (manifest idx values may be
+            # missing or duplicated, so they can't key the slots) and no
+            # post-hoc sort is needed.
+            results_by_pos: List[Optional[tuple]] = [None] * len(chunks_meta)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all chunks for processing
+                future_to_chunk = {executor.submit(_process_chunk, ch): (i, ch) for i, ch in enumerate(chunks_meta)}
+
+                # Collect results as they complete
+                for future in as_completed(future_to_chunk):
+                    try:
+                        results_by_pos[future_to_chunk[future][0]] = future.result()
+                    except Exception as e:
+                        # Don't let the remaining uploads keep burning quota once
+                        # the run is doomed; cancel whatever hasn't started yet.
+                        for pending in future_to_chunk:
+                            pending.cancel()
+                        ch = future_to_chunk[future][1]
+                        idx = ch.get("idx", "?")
+                        raise ToolError(f"Chunk {idx} processing failed: {e}", tool_name=tool)
+
+            # Build results in manifest order. Every slot must be filled once
+            # the pool drains cleanly; a hole means results were lost, which
+            # must fail loudly rather than ship a truncated transcript.
+            if any(r is None for r in results_by_pos):
+                raise ToolError("Chunk results incomplete after processing pool drained.", tool_name=tool)
+            for result in results_by_pos:
+                idx, start_s, end_s, text, summary_text, media_path, chunk_artifact = result
+                if text:
+                    combined_parts.append(text)
+                chunk_results.append(Chunk(start_s=int(start_s), end_s=int(end_s), text=text, summary=(summary_text or None)))
+                artifacts["chunks"].append(chunk_artifact)
+
+    finally:
+        # Flush queued artifact writes before paths in state are trusted
+        write_q.put(None)
+        writer_thread.join()
 
-    # Combined transcript
-    combined_text = "\n\n".join([p for p in combined_parts if p])
+    # Combined transcript: parts are appended pre-stripped and non-empty, so no
+    # filtering comprehension or trailing re-strip is needed here. The joined
+    # copy exists only for state.transcript; the file write streams the parts
+    # directly so the multi-hour transcript isn't concatenated twice.
+    combined_text = "\n\n".join(combined_parts)
     all_txt_path = out_dir / "transcript.gemini.txt"
     try:
-        with open(all_txt_path, "w", encoding="utf-8") as f:
-            f.write(combined_text.strip() + "\n")
+        with open(all_txt_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            for i, p in enumerate(combined_parts):
+                if i:
+                    f.write("\n\n")
+                f.write(p)
+            f.write("\n")
         artifacts["combined_transcript_path"] = str(all_txt_path)
     except Exception:
         pass
@@ -538,6 +1006,8 @@ def summarise_gemini(
                 "path": video_path,
                 "gemini_file_name": gem_file,
                 "text": text,
+                # Stored pre-stripped (see read above) so prompt assembly and the
+                # local fallback don't rescan multi-KB summaries for whitespace.
                 "summary": summary_text,
             }
         )
@@ -567,6 +1037,36 @@ def summarise_gemini(
         # Force map-reduce/text path by making the direct threshold unreachable
         minutes_limit = -1.0
 
+    # Optional Gemini context cache (GEMINI_CONTEXT_CACHE=1): repeat questions
+    # against the same video reuse one server-side cached-content entry instead
+    # of re-attaching every chunk file on each call. Keyed by the exact set of
+    # Gemini file names so a re-transcription invalidates it naturally. Opt-in
+    # because cached content is billed per storage-hour.
+    ctx_cache_on = (os.getenv("GEMINI_CONTEXT_CACHE", "") or "").strip().lower() in {"1", "true", "yes", "on"}
+    ctx_cache_key: Optional[str] = None
+    ctx_cache_name: Optional[str] = None
+    if ctx_cache_on:
+        names = [str(ch["gemini_file_name"]) for ch in chunks_with_paths if ch.get("gemini_file_name")]
+        if names and len(names) == len(chunks_with_paths):
+            ctx_cache_key = hashlib.blake2b("\n".join(sorted(names)).encode("utf-8"), digest_size=16).hexdigest()
+            rec = ta.get("context_cache")
+            if isinstance(rec, dict) and rec.get("key") == ctx_cache_key and rec.get("name"):
+                ctx_cache_name = rec["name"]
+
+    # Prefetch: when the direct multimodal path is in play, start resolving the
+    # known Gemini file handles in the background now, so the network round-trips
+    # overlap with the local metadata/token bookkeeping below instead of running
+    # cold once the global call is assembled. Pointless when a context cache is
+    # live, since no files get attached then.
+    prefetch_files: Dict[int, Any] = {}
+    prefetch_ex: Optional[ThreadPoolExecutor] = None
+    if ctx_cache_name is None and ((float(total_duration_s) / 60.0) if total_duration_s else 0.0) <= minutes_limit:
+        named = [ch for ch in chunks_with_paths if ch.get("gemini_file_name")]
+        if named:
+            prefetch_ex = ThreadPoolExecutor(max_workers=min(8, len(named)))
+            for ch in named:
+                prefetch_files[ch["idx"]] = prefetch_ex.submit(client.files.get, name=ch["gemini_file_name"])
+
     # Prepare optional metadata string
     meta_lines: List[str] = []
     if include_metadata:
@@ -617,6 +1117,7 @@ def summarise_gemini(
     total_minutes = float(total_duration_s) / 60.0 if total_duration_s else 0.0
 
     def _direct_multimodal() -> str:
+        nonlocal ctx_cache_name
         system_instruction = _load_prompt_text("global_prompt.txt")
         contents: List[Any] = []
         meta_block = f"Video metadata:\n{meta_text}\n\n" if meta_text else ""
@@ -630,10 +1131,44 @@ def summarise_gemini(
         )
         contents.append(user_prompt_text)
 
-        # Attach files via existing Gemini file names if possible; otherwise re-upload as fallback
-        for ch in chunks_with_paths:
+        # Prefer top-level system_instruction and generation_config, fallback to config
+        max_out = 0
+        if isinstance(_gen_cfg, dict):
+            try:
+                max_out = int(_gen_cfg.get("max_output_tokens", 0) or 0)
+            except Exception:
+                max_out = 0
+
+        # A live context cache already holds the media and system instruction
+        # server-side: send only the question. A failed call here means the
+        # cache expired or was evicted, so drop it and rebuild via the normal
+        # attach path below.
+        if ctx_cache_name is not None and genai_types is not None:
+            try:
+                response = client.models.generate_content(
+                    model=model,
+                    contents=[user_prompt_text],
+                    config=genai_types.GenerateContentConfig(
+                        cached_content=ctx_cache_name,
+                        max_output_tokens=(max_out or None),
+                    ),
+                )
+                return getattr(response, "text", None) or ""
+            except Exception:
+                ctx_cache_name = None
+
+        # Attach files via existing Gemini file names if possible; otherwise re-upload as fallback.
+        # Each resolution blocks on HTTP (files.get or upload+poll), so overlap them
+        # across a thread pool while preserving chunk order in `contents`.
+        def _resolve_media(ch: Dict[str, Any]):
             mf = None
-            if ch.get("gemini_file_name"):
+            fut = prefetch_files.get(ch.get("idx"))
+            if fut is not None:
+                try:
+                    mf = fut.result()
+                except Exception:
+                    mf = None
+            if mf is None and ch.get("gemini_file_name"):
                 try:
                     mf = client.files.get(name=ch["gemini_file_name"])  # type: ignore
                 except Exception:
@@ -641,21 +1176,28 @@ def summarise_gemini(
             if mf is None:
                 p = ch.get("path")
                 if p and Path(p).exists():
-                    try:
-                        mf = client.files.upload(file=str(p))
-                        _ = _poll_file_active(client, name=getattr(mf, "name", None) or getattr(mf, "id", None) or str(mf), max_wait=float(os.getenv("GEMINI_FILE_WAIT_TIMEOUT", "300")))
-                    except Exception:
-                        mf = None
-            if mf is not None:
-                contents.append(mf)
+                    mf = _lookup_uploaded(client, str(p))
+                    if mf is None:
+                        try:
+                            mf = client.files.upload(file=str(p))
+                            _ = _poll_file_active(client, name=getattr(mf, "name", None) or getattr(mf, "id", None) or str(mf), max_wait=float(os.getenv("GEMINI_FILE_WAIT_TIMEOUT", "300")))
+                            _remember_uploaded(str(p), getattr(mf, "name", None) or getattr(mf, "id", None))
+                        except Exception:
+                            mf = None
+            return mf
+
+        try:
+            attach_workers = int(os.getenv("CHUNK_WORKERS", "8") or 8)
+        except Exception:
+            attach_workers = 8
+        if len(chunks_with_paths) > 1 and attach_workers > 1:
+            with ThreadPoolExecutor(max_workers=attach_workers) as ex:
+                resolved = list(ex.map(_resolve_media, chunks_with_paths))
+        else:
+            resolved = [_resolve_media(ch) for ch in chunks_with_paths]
+        resolved_files = [mf for mf in resolved if mf is not None]
+        contents.extend(resolved_files)
 
-        # Prefer top-level system_instruction and generation_config, fallback to config
-        max_out = 0
-        if isinstance(_gen_cfg, dict):
-            try:
-                max_out = int(_gen_cfg.get("max_output_tokens", 0) or 0)
-            except Exception:
-                max_out = 0
         if genai_types is not None:
             gen_cfg_dict = {"max_output_tokens": max_out} if max_out else None
             try:
@@ -699,38 +1241,61 @@ def summarise_gemini(
                     model=model,
                     contents=contents,
                 )
+
+        # Best-effort: build the server-side cache so the next question against
+        # this video skips the attach round-trips entirely.
+        if ctx_cache_on and ctx_cache_key and ctx_cache_name is None and genai_types is not None and resolved_files:
+            try:
+                ttl_s = int(float(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600")))
+                cc = client.caches.create(
+                    model=model,
+                    config=genai_types.CreateCachedContentConfig(
+                        contents=resolved_files,
+                        system_instruction=(system_instruction if (system_instruction or "").strip() else None),
+                        ttl=f"{ttl_s}s",
+                    ),
+                )
+                cc_name = getattr(cc, "name", None)
+                if cc_name:
+                    ta["context_cache"] = {"key": ctx_cache_key, "name": cc_name}
+                    state.artifacts["transcribe_asr"] = ta
+            except Exception:
+                pass
+
         return getattr(response, "text", None) or ""
 
     def _map_reduce() -> str:
         system_instruction = _load_prompt_text("global_prompt.txt")
-        header = [f"User request:\n{user_req}"]
-        header.append("Important: Do not include any timestamps in the output.")
+        buf = io.StringIO()
+        buf.write(f"User request:\n{user_req}\n")
+        buf.write("Important: Do not include any timestamps in the output.\n")
         if intent and isinstance(intent, str) and intent.strip():
-            header.append(f"Intent: {intent.strip()}")
+            buf.write(f"Intent: {intent.strip()}\n")
         if meta_text:
-            header.append(f"\nVideo metadata:\n{meta_text}")
+            buf.write(f"\nVideo metadata:\n{meta_text}\n")
         if _target_len_line:
-            header.append(_target_len_line.strip())
-        header.append("\nBelow are per-chunk summaries and short raw excerpts. Synthesize them into a single, coherent response.")
-        header.append("CHUNKS:")
+            buf.write(_target_len_line.strip() + "\n")
+        buf.write("\nBelow are per-chunk summaries and short raw excerpts. Synthesize them into a single, coherent response.\n")
+        buf.write("CHUNKS:\n")
 
-        parts: List[str] = []
         excerpt_len = 400
         try:
             excerpt_len = int(os.getenv("GLOBAL_EXCERPT_CHARS", "400") or 400)
         except Exception:
             pass
         for ch in chunks_with_paths:
-            excerpt = (ch.get("text") or "")[: max(0, excerpt_len)]
-            parts.append(
-                (
-                    f"---\n"
-                    f"Chunk {ch['idx']}\n"
-                    f"Summary of this chunk:\n{(ch.get('summary') or '').strip()}\n\n"
-                    f"Transcript excerpt:\n{excerpt.strip()}\n"
+            # Strip only a bounded head slice; a full-string strip would touch
+            # every byte of a multi-MB transcript just to emit a short excerpt.
+            raw = ch.get("text") or ""
+            excerpt = raw[: max(0, excerpt_len) * 2].strip()[: max(0, excerpt_len)]
+            buf.write(
+                _CHUNK_PART_TMPL.format(
+                    idx=ch["idx"],
+                    summary=ch.get("summary") or "",
+                    excerpt=excerpt,
                 )
             )
-        content_text = "\n".join(header + parts)
+        content_text = buf.getvalue().rstrip("\n")
         # Prefer top-level system_instruction and generation_config, fallback to config
         max_out = 0
         if isinstance(_gen_cfg, dict):
@@ -799,10 +1364,12 @@ def summarise_gemini(
                 }
             )
         except Exception as e:
-            msg = str(e).lower()
-            if not any(k in msg for k in ["context", "token", "length", "too large", "deadline", "quota", "rate", "503", "429"]):
+            if not _FALLBACK_ERR_RE.search(str(e)):
                 raise
             # Fall back
+        finally:
+            if prefetch_ex is not None:
+                prefetch_ex.shutdown(wait=False)
 
     # Fallback or long videos: map-reduce
     if not result_text:
@@ -822,11 +1389,7 @@ def summarise_gemini(
     # Local fallback if the model returned empty text
     if not (result_text or "").strip():
         def _local_fallback() -> str:
-            summaries = [
-                (ch.get("summary") or "").strip()
-                for ch in chunks_with_paths
-                if (ch.get("summary") or "").strip()
-            ]
+            summaries = [ch["summary"] for ch in chunks_with_paths if ch.get("summary")]
             if summaries:
                 return "\n".join(summaries)
             # As a last resort, include short excerpts to avoid an empty file
@@ -852,7 +1415,7 @@ def summarise_gemini(
         summary_dir = Path(runtime_dir) / "summaries" / job_id
         summary_dir.mkdir(parents=True, exist_ok=True)
         gp = summary_dir / "global_summary.gemini.txt"
-        gp.write_text((result_text or "").strip() + "\n", encoding="utf-8")
+        _write_text_atomic(gp, (result_text or "").strip() + "\n")
         state.artifacts.setdefault(tool_name, {})
         state.artifacts[tool_name]["global_summary_path"] = str(gp)
     except Exception:
@@ -1028,7 +1591,7 @@ def summarise_url_direct(
         summary_dir = Path(runtime_dir) / "summaries" / job_id
         summary_dir.mkdir(parents=True, exist_ok=True)
         qp = summary_dir / "quick_take.gemini.txt"
-        qp.write_text((text or "").strip() + "\n", encoding="utf-8")
+        _write_text_atomic(qp, (text or "").strip() + "\n")
     except Exception:
         pass
 